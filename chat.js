@@ -23,6 +23,7 @@ function appendMessage(role, text) {
   div.textContent = text;
   chatWindow.appendChild(div);
   scrollToBottom();  // 말풍선 추가할 때마다 맨 아래로 이동
+  return div;
 }
 
 // 로딩 상태 표시
@@ -46,7 +47,7 @@ async function sendQuestion() {
       method: "POST",
       headers: {
         "Content-Type": "application/json",
-        accept: "application/json",
+        accept: "application/json, text/plain",
       },
       body: JSON.stringify({ question }),
     });
@@ -61,9 +62,26 @@ async function sendQuestion() {
       return;
     }
 
-    const data = await res.json();
-    const answer = data.answer ?? "(answer 필드가 없습니다.)";
-    appendMessage("bot", answer);
+    // staff.json 등 바로 답할 수 있는 경우는 JSON, LLM 답변은 텍스트 스트림
+    const contentType = res.headers.get("content-type") || "";
+    if (contentType.includes("application/json")) {
+      const data = await res.json();
+      const answer = data.answer ?? "(answer 필드가 없습니다.)";
+      appendMessage("bot", answer);
+      return;
+    }
+
+    // 스트림: 도착하는 대로 같은 말풍선에 이어 붙이기
+    const botDiv = appendMessage("bot", "");
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder("utf-8");
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      botDiv.textContent += decoder.decode(value, { stream: true });
+      scrollToBottom();
+    }
+    botDiv.textContent += decoder.decode();
   } catch (e) {
     appendMessage("bot", "요청 중 오류가 발생했습니다: " + e);
   } finally {
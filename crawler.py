@@ -1,14 +1,21 @@
 # crawler/crawler.py
 
-import time
-import json
+import asyncio
 import hashlib
-from collections import deque
+import math
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from html import unescape
 from pathlib import Path
 from urllib.parse import urljoin, urlparse
 
-import requests
-from bs4 import BeautifulSoup
+import httpx
+import orjson
+from lxml import etree
+from lxml import html as lx
 
 # -------------------------
 # 1. 크롤링 설정
@@ -23,6 +30,14 @@ START_URLS = [
 
 # 허용할 도메인 (이 도메인 밖 링크는 크롤링하지 않음)
 ALLOWED_DOMAIN = "ogya-h.gne.go.kr"
+_ALLOWED_SUBDOMAIN_SUFFIX = "." + ALLOWED_DOMAIN
+
+# 크롤링하지 않을 파일 확장자 (pdf, hwp, xls, 이미지 등)
+BLOCKED_EXT = (
+    ".pdf", ".hwp", ".hwpx", ".xls", ".xlsx",
+    ".doc", ".docx", ".ppt", ".pptx",
+    ".jpg", ".jpeg", ".png", ".gif", ".zip"
+)
 
 # 최대 크롤링 페이지 수 / 깊이 제한
 MAX_PAGES = 100       # 수집할 최대 페이지 수
@@ -32,9 +47,16 @@ MAX_DEPTH = 3         # 링크를 최대 몇 단계까지 따라갈지
 BASE_DIR = Path(__file__).resolve().parent.parent
 CRAWL_OUT = BASE_DIR / "data" / "crawled" / "raw_pages.jsonl"
 
+# 다음 크롤링 때 조건부 요청(ETag / Last-Modified)에 쓸 URL별 캐시 정보
+ETAGS_OUT = BASE_DIR / "data" / "crawled" / "etags.json"
+
 # 요청 간 딜레이 (서버 배려)
 REQUEST_DELAY = 0.5
 
+# 동시에 페이지를 가져올 워커 수
+# (요청 시작은 모든 워커를 통틀어 REQUEST_DELAY / NUM_WORKERS 간격 이상 벌림)
+NUM_WORKERS = 8
+
 # User-Agent (없으면 접속이 막히는 경우를 방지)
 HEADERS = {
     "User-Agent": "SchoolAIBotCrawler/0.1 (local project)"
@@ -44,6 +66,36 @@ HEADERS = {
 # 2. 유틸 함수들
 # -------------------------
 
+class BloomFilter:
+    """
+    방문한 URL 중복 체크용 블룸 필터.
+    set보다 메모리를 훨씬 적게 쓰는 대신, error_rate 확률로
+    처음 보는 URL을 '이미 방문함'으로 잘못 판단할 수 있습니다. (크롤링에서는 그냥 건너뜀)
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        # 비트 수 m = -n ln(p) / (ln 2)^2, 해시 수 k = (m / n) ln 2
+        n_bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.num_bits = max(n_bits, 8)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, item: str):
+        # 해시 한 번으로 두 값을 만들어 k개 위치를 생성 (Kirsch-Mitzenmacher double hashing)
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
 def is_allowed_url(url: str) -> bool:
     """
     도메인 / 스킴 / 파일 타입만 체크해서
@@ -55,45 +107,78 @@ def is_allowed_url(url: str) -> bool:
     except Exception:
         return False
 
-    if parsed.scheme not in ("http", "https"):
-        return False
+    return _is_allowed_parts(parsed.scheme, parsed.hostname or "", parsed.path)
 
-    # 도메인 체크
-    if ALLOWED_DOMAIN not in parsed.netloc:
+
+def _is_allowed_parts(scheme: str, host: str, path: str) -> bool:
+    """
+    is_allowed_url의 실제 검사. 이미 나눠 둔 scheme/host/path를 받아서
+    링크마다 URL을 다시 파싱하지 않아도 되게 합니다.
+    """
+    if scheme not in ("http", "https"):
         return False
 
-    path_lower = parsed.path.lower()
+    # 도메인 체크 (ALLOWED_DOMAIN 자신 또는 그 하위 도메인만 허용)
+    if host != ALLOWED_DOMAIN and not host.endswith(_ALLOWED_SUBDOMAIN_SUFFIX):
+        return False
 
     # 파일 다운로드 등은 제외 (pdf, hwp, xls, 이미지 등)
-    blocked_ext = (
-        ".pdf", ".hwp", ".hwpx", ".xls", ".xlsx",
-        ".doc", ".docx", ".ppt", ".pptx",
-        ".jpg", ".jpeg", ".png", ".gif", ".zip"
-    )
-    if any(path_lower.endswith(ext) for ext in blocked_ext):
+    if path.lower().endswith(BLOCKED_EXT):
         return False
 
     return True
 
 
-def fetch_html(url: str) -> str | None:
+# fetch_html이 304 Not Modified를 받았을 때 돌려주는 표시값
+NOT_MODIFIED = object()
+
+
+async def fetch_html(
+    client: httpx.AsyncClient, url: str, cached: dict | None = None
+) -> tuple[str | object | None, dict]:
     """
-    해당 URL의 HTML을 가져옵니다. 실패하면 None을 반환합니다.
+    해당 URL의 HTML과 다음 조건부 요청에 쓸 헤더(etag, last_modified)를 가져옵니다.
+    실패하면 (None, {}), 지난번 이후 바뀌지 않았으면 (NOT_MODIFIED, cached)를 반환합니다.
+    (여러 워커가 같은 client의 커넥션 풀을 공유합니다.)
     """
+    headers = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
     try:
         print(f"[FETCH] {url}")
-        res = requests.get(url, headers=HEADERS, timeout=5)
+        res = await client.get(url, headers=headers, timeout=5)
+        if res.status_code == 304 and cached:
+            return NOT_MODIFIED, cached
         if res.status_code != 200:
             print(f"  -> HTTP {res.status_code}, skip")
-            return None
+            return None, {}
 
-        if not res.encoding:
-            res.encoding = res.apparent_encoding or "utf-8"
+        # charset 헤더가 없으면 httpx가 utf-8로 디코딩합니다.
         html = res.text
-        return html
+        validators = {
+            "etag": res.headers.get("etag"),
+            "last_modified": res.headers.get("last-modified"),
+        }
+        return html, validators
     except Exception as e:
         print(f"  -> ERROR: {e}")
-        return None
+        return None, {}
+
+
+# clean_lines에서 버릴 잡음 줄 패턴 (한 번의 search로 모두 검사)
+_NOISE_RE = re.compile(
+    r"copyright"
+    r"|경상남도.*교육청|교육청.*경상남도"
+    r"|전화.*-|-.*전화"
+    r"|팩스.*-|-.*팩스"
+    r"|무단 전재|재배포 금지"
+    r"|홈 >|home >",
+    re.IGNORECASE,
+)
 
 
 def clean_lines(text: str) -> str:
@@ -111,22 +196,9 @@ def clean_lines(text: str) -> str:
         if len(ln) <= 2:
             continue
 
-        lower = ln.lower()
-
         # 2) 주소/저작권/전화 등 매 페이지 반복되는 공통 문구 제거 (예시)
-        if "copyright" in lower:
-            continue
-        if "경상남도" in ln and "교육청" in ln:
-            continue
-        if "전화" in ln and "-" in ln:
-            continue
-        if "팩스" in ln and "-" in ln:
-            continue
-        if "무단 전재" in ln or "재배포 금지" in ln:
-            continue
-
         # 3) 네비게이션 흔적 (예: "홈 > 학교소개 > 교직원 소개")
-        if "홈 >" in ln or "home >" in lower:
+        if _NOISE_RE.search(ln):
             continue
 
         # 4) 이전 줄과 완전히 같은 내용이면 중복 제거
@@ -142,59 +214,97 @@ def clean_lines(text: str) -> str:
     return "\n".join(cleaned_lines)
 
 
-def extract_main_text(url: str, html: str) -> tuple[str, str]:
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# 제거할 영역: 스크립트/스타일/주석, 상단/하단/공통 메뉴, 사이트 공통 템플릿
+# 한 번의 XPath로 전부 찾음 (실제 HTML 구조 보고 항목을 추가/수정하면 좋습니다.)
+_STRIP_XP = etree.XPath(" | ".join([
+    "//script", "//style", "//noscript", "//comment()",
+    "//header", "//footer", "//nav", "//aside",
+    "//div[@id='gnb']",                    # 글로벌 메뉴
+    "//div[@id='lnb']",                    # 좌측 메뉴
+    "//div[@id='footer_wrap']",            # 하단 전체
+    f"//div[{_has_class('menu')}]",        # 기타 메뉴 블록
+]))
+
+# 본문이 나올 법한 영역 후보들 (실제 사이트 구조 보고 튜닝)
+# 한 번의 XPath로 후보를 모두 찾은 뒤, 아래 순서(앞일수록 우선)로 고름
+_MAIN_XP = etree.XPath(" | ".join([
+    "//div[@id='contents']",
+    "//div[@id='content']",
+    f"//div[@id='container']//div[{_has_class('contents')}]",
+    f"//div[{_has_class('board_view')}]",
+    "//div[@id='cms_content']",
+]))
+
+
+def _main_priority(el) -> int:
+    """_MAIN_XP로 찾은 요소가 위 후보 목록 중 몇 번째 조건에 해당하는지 (작을수록 우선)"""
+    classes = (el.get("class") or "").split()
+    if el.get("id") == "contents":
+        return 0
+    if el.get("id") == "content":
+        return 1
+    if "contents" in classes and any(a.get("id") == "container" for a in el.iterancestors("div")):
+        return 2
+    if "board_view" in classes:
+        return 3
+    return 4
+
+
+_HREF_XP = etree.XPath("//a/@href")
+
+# 링크 수집용: DOM을 만들지 않고 원본 HTML에서 <a ... href=...>만 바로 찾음
+_HREF_RE = re.compile(
+    r"""<a\b[^>]*?(?<![\w-])href\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""",
+    re.IGNORECASE,
+)
+
+# urljoin 없이 "현재 호스트 + href"로 바로 붙여도 결과가 같은 단순 절대 경로
+# (예: "/ogya-h/main.do?x=1"; "//host", "./", "../", ";params", 빈 ?/# 는 제외)
+_SIMPLE_PATH_RE = re.compile(r"/(?![/.])(?:[^\s;?#/]|/(?![/.]))*(?:\?[^\s#]+)?(?:#\S+)?")
+
+# httpx가 이미 디코딩한 문자열을 utf-8로 다시 넘기므로 <meta charset>은 무시하게 함
+_HTML_PARSER = lx.HTMLParser(encoding="utf-8")
+
+
+def extract_page(url: str, html: str) -> tuple[str, str]:
     """
     HTML에서 제목과 '본문 텍스트'를 추출합니다.
-    학교 사이트 구조에 맞게 selector를 조정하면서 튜닝할 수 있습니다.
+    학교 사이트 구조에 맞게 XPath를 조정하면서 튜닝할 수 있습니다.
     """
-    soup = BeautifulSoup(html, "lxml")
+    try:
+        tree = lx.fromstring(html.encode("utf-8"), parser=_HTML_PARSER)
+    except (etree.ParserError, ValueError):
+        return "", ""
 
     # 제목 추출: <title> 또는 <h1>
-    title = ""
-    if soup.title and soup.title.string:
-        title = soup.title.string.strip()
-    else:
-        h1 = soup.find("h1")
-        if h1 and h1.get_text(strip=True):
-            title = h1.get_text(strip=True)
-
-    # 스크립트/스타일/노스크립트 제거
-    for tag in soup(["script", "style", "noscript"]):
-        tag.decompose()
-
-    # 상단/하단/공통 메뉴 영역 제거
-    for tag in soup.find_all(["header", "footer", "nav", "aside"]):
-        tag.decompose()
-
-    # 사이트 공통 템플릿 영역 (실제 HTML 구조 보고 selector를 추가/수정하면 좋습니다.)
-    for selector in [
-        "div#gnb",          # 글로벌 메뉴
-        "div#lnb",          # 좌측 메뉴
-        "div#footer_wrap",  # 하단 전체
-        "div.menu",         # 기타 메뉴 블록
-    ]:
-        for tag in soup.select(selector):
-            tag.decompose()
-
-    # 본문이 나올 법한 영역 후보들 (실제 사이트 구조 보고 튜닝)
-    main = None
-    for selector in [
-        "div#contents",
-        "div#content",
-        "div#container div.contents",
-        "div.board_view",
-        "div#cms_content",
-    ]:
-        main = soup.select_one(selector)
-        if main:
-            break
+    title = (tree.findtext(".//title") or "").strip()
+    if not title:
+        h1 = tree.find(".//h1")
+        if h1 is not None:
+            title = h1.text_content().strip()
+
+    # 불필요한 영역 비우기 (뒤따르는 tail 텍스트는 별도 줄로 남겨 둠)
+    for el in _STRIP_XP(tree):
+        tail = el.tail
+        el.clear()
+        el.tail = tail
+
+    # 우선순위가 같으면 문서에서 먼저 나온 것 (min은 첫 번째 최소값을 돌려줌)
+    found = _MAIN_XP(tree)
+    main = min(found, key=_main_priority) if found else None
 
     # 그래도 못 찾으면 body 전체 사용
     if main is None:
-        main = soup.body or soup
+        main = tree.find("body")
+        if main is None:
+            main = tree
 
     # 줄 바꿈 기준으로 텍스트 추출
-    text = main.get_text(separator="\n", strip=True)
+    text = "\n".join(t.strip() for t in main.itertext() if t.strip())
 
     # 라인 단위로 후처리
     cleaned = clean_lines(text)
@@ -206,17 +316,41 @@ def extract_links(base_url: str, html: str) -> list[str]:
     """
     페이지 안의 a[href] 링크들을 모아서 절대 URL로 변환한 뒤,
     is_allowed_url로 한 번 더 필터링합니다.
+    링크 발견용이라 정규식으로 느슨하게 찾고, 하나도 못 찾았을 때만 lxml로 파싱합니다.
     """
-    soup = BeautifulSoup(html, "lxml")
+    hrefs = [unescape(a or b or c) for a, b, c in _HREF_RE.findall(html)]
+    if not hrefs:
+        try:
+            hrefs = _HREF_XP(lx.fromstring(html.encode("utf-8"), parser=_HTML_PARSER))
+        except (etree.ParserError, ValueError):
+            return []
+
+    # 페이지 URL은 한 번만 파싱해서 모든 링크에 재사용
+    base = urlparse(base_url)
+    base_origin = f"{base.scheme}://{base.netloc}"
+    base_host = base.hostname or ""
+
     links = []
-    for a in soup.find_all("a", href=True):
-        href = a["href"].strip()
+    for href in hrefs:
+        href = href.strip()
         # 빈 링크, 앵커(#), 자바스크립트 링크는 제외
         if not href or href.startswith("#") or href.lower().startswith("javascript:"):
             continue
 
-        abs_url = urljoin(base_url, href)
-        if is_allowed_url(abs_url):
+        if _SIMPLE_PATH_RE.fullmatch(href):
+            # 가장 흔한 "/경로" 링크: scheme/host는 페이지와 같으므로 path만 확인
+            abs_url = base_origin + href
+            path = href.split("?", 1)[0].split("#", 1)[0]
+            allowed = _is_allowed_parts(base.scheme, base_host, path)
+        else:
+            try:
+                abs_url = urljoin(base_url, href)
+                parsed = urlparse(abs_url)
+                allowed = _is_allowed_parts(parsed.scheme, parsed.hostname or "", parsed.path)
+            except ValueError:
+                continue
+
+        if allowed:
             links.append(abs_url)
     return links
 
@@ -224,81 +358,198 @@ def extract_links(base_url: str, html: str) -> list[str]:
 def text_hash(text: str) -> str:
     """
     텍스트 내용에 대한 해시값. 변경 감지용으로 사용 가능합니다.
+    (보안용이 아니므로 md5보다 빠른 blake2b 128비트를 사용)
+    """
+    return hashlib.blake2b(text.encode("utf-8", errors="ignore"), digest_size=16).hexdigest()
+
+
+def load_previous_crawl(out_path: Path, etags_path: Path) -> tuple[dict, dict]:
     """
-    return hashlib.md5(text.encode("utf-8", errors="ignore")).hexdigest()
+    지난 크롤링 결과(raw_pages.jsonl)와 etags.json을 읽어 URL별로 돌려줍니다.
+    둘 다 있는 URL만 조건부 요청 대상으로 씁니다. (304면 지난 레코드를 그대로 재사용)
+    """
+    records = {}
+    if out_path.exists():
+        with out_path.open("rb") as f:
+            for line in f:
+                try:
+                    record = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue
+                records[record["url"]] = record
+
+    cache = {}
+    if etags_path.exists():
+        try:
+            cache = orjson.loads(etags_path.read_bytes())
+        except orjson.JSONDecodeError:
+            cache = {}
+
+    cache = {url: entry for url, entry in cache.items() if url in records}
+    return records, cache
 
 
 # -------------------------
 # 3. 메인 크롤링 루프
 # -------------------------
 
-def crawl():
-    visited = set()
+async def crawl_async():
+    # 페이지당 링크가 많으므로 MAX_PAGES보다 넉넉하게 잡음
+    visited = BloomFilter(capacity=MAX_PAGES * 50, error_rate=0.001)
     out_path = CRAWL_OUT
 
+    # 결과 파일을 비우기 전에 지난 결과를 읽어 둠 (바뀌지 않은 페이지 재사용)
+    prev_records, prev_cache = load_previous_crawl(out_path, ETAGS_OUT)
+    new_cache = {}
+
     # 매번 새로 크롤링한다고 가정하고 결과 파일 초기화
     out_path.parent.mkdir(parents=True, exist_ok=True)
     out_path.write_text("", encoding="utf-8")
 
-    queue = deque()
+    queue: asyncio.Queue[tuple[str, int]] = asyncio.Queue()
 
     # START_URLS는 필터 안 거치고 무조건 큐에 넣어줌
     for url in START_URLS:
         print(f"[SEED] {url}")
-        queue.append((url, 0))  # (url, depth)
+        queue.put_nowait((url, 0))  # (url, depth)
 
     page_count = 0
 
-    while queue and page_count < MAX_PAGES:
-        url, depth = queue.popleft()
+    # 서버 배려: 모든 워커가 공유하는 요청 시작 간격
+    # (RTT와 상관없이 초당 NUM_WORKERS / REQUEST_DELAY 회를 넘지 않음)
+    request_gap = REQUEST_DELAY / NUM_WORKERS
+    rate_lock = asyncio.Lock()
+    last_start = 0.0
+
+    async def wait_for_turn():
+        nonlocal last_start
+        async with rate_lock:
+            wait = last_start + request_gap - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            last_start = time.monotonic()
+
+    async def visit(client: httpx.AsyncClient, pool: ProcessPoolExecutor, out_f, url: str, depth: int):
+        nonlocal page_count
+
+        if page_count >= MAX_PAGES:
+            return
         if url in visited:
-            continue
+            return
         visited.add(url)
 
         if depth > MAX_DEPTH:
-            continue
+            return
 
         # 링크에서 넘어온 것만 필터 적용
         if not is_allowed_url(url):
             print(f"[SKIP] not allowed: {url}")
-            continue
+            return
 
-        html = fetch_html(url)
-        if html is None:
-            continue
+        cached = prev_cache.get(url)
+        await wait_for_turn()
 
-        title, text = extract_main_text(url, html)
-        if not text:
-            print(f"[SKIP] empty text: {url}")
-            continue
+        # 차례를 기다리는 동안 다른 워커가 최대 페이지 수를 채웠을 수 있음
+        if page_count >= MAX_PAGES:
+            return
 
-        page_hash = text_hash(text)
+        html, validators = await fetch_html(client, url, cached)
 
-        record = {
-            "url": url,
-            "title": title,
-            "depth": depth,
-            "text": text,
-            "hash": page_hash,
-        }
+        if html is None:
+            return
+
+        if html is NOT_MODIFIED:
+            # 바뀌지 않은 페이지: 파싱 없이 지난 레코드와 링크를 그대로 사용
+            print("  -> 304 Not Modified, reuse")
+            if page_count >= MAX_PAGES:
+                return
+            record = {**prev_records[url], "depth": depth}
+            links = cached.get("links", [])
+        else:
+            # 파싱은 CPU 작업이라 프로세스 풀에서 (그동안 다른 워커는 계속 다운로드)
+            # 링크는 가벼운 정규식이라 파싱을 기다리는 동안 여기서 바로 수집
+            loop = asyncio.get_running_loop()
+            parsed = loop.run_in_executor(pool, extract_page, url, html)
+            links = extract_links(url, html)
+            title, text = await parsed
+            if not text:
+                print(f"[SKIP] empty text: {url}")
+                return
+
+            # 다른 워커가 기다리는 동안 최대 페이지 수를 채웠을 수 있음
+            if page_count >= MAX_PAGES:
+                return
+
+            page_hash = text_hash(text)
+
+            record = {
+                "url": url,
+                "title": title,
+                "depth": depth,
+                "text": text,
+                "hash": page_hash,
+            }
+
+        new_cache[url] = {**validators, "hash": record["hash"], "links": links}
 
         # JSONL 형식으로 한 줄에 한 페이지씩 저장
-        with out_path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        # (write는 await 없이 끝나므로 워커끼리 줄이 섞이지 않음)
+        out_f.write(orjson.dumps(record) + b"\n")
 
         page_count += 1
         print(f"[SAVE] {url} (depth={depth}, pages={page_count})")
 
         # 다음에 방문할 링크들 큐에 추가
-        links = extract_links(url, html)
         for link in links:
             if link not in visited:
-                queue.append((link, depth + 1))
-
-        time.sleep(REQUEST_DELAY)
+                queue.put_nowait((link, depth + 1))
+
+    async def worker(client: httpx.AsyncClient, pool: ProcessPoolExecutor, out_f):
+        while True:
+            url, depth = await queue.get()
+            try:
+                await visit(client, pool, out_f, url, depth)
+            except Exception as e:
+                # 워커가 죽으면 queue.join()이 끝나지 않으므로 로그만 남기고 계속
+                print(f"[ERROR] {url}")
+                print(f"  -> ERROR: {e}")
+            finally:
+                queue.task_done()
+
+    limits = httpx.Limits(max_connections=NUM_WORKERS, max_keepalive_connections=NUM_WORKERS)
+
+    # 결과 파일은 한 번만 열어서 모든 페이지를 이어서 씀
+    # (orjson이 바로 UTF-8 bytes를 만들어 주므로 바이너리 모드)
+    out_f = out_path.open("ab", buffering=1 << 16)
+    try:
+        # 동시에 파싱하는 페이지는 많아야 NUM_WORKERS개이므로 그 이상은 만들지 않음.
+        # 첫 요청 때 DNS 조회 스레드가 생긴 뒤 fork되지 않도록 spawn으로 띄움
+        with ProcessPoolExecutor(
+            max_workers=min(NUM_WORKERS, os.cpu_count() or 1),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            async with httpx.AsyncClient(headers=HEADERS, limits=limits) as client:
+                workers = [
+                    asyncio.create_task(worker(client, pool, out_f))
+                    for _ in range(NUM_WORKERS)
+                ]
+
+                # 큐가 빌 때까지 기다린 뒤 워커 종료
+                await queue.join()
+                for w in workers:
+                    w.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+    finally:
+        out_f.close()
+
+    ETAGS_OUT.write_bytes(orjson.dumps(new_cache))
 
     print(f"크롤링 완료: {page_count} 페이지 수집, 결과: {out_path}")
 
 
+def crawl():
+    asyncio.run(crawl_async())
+
+
 if __name__ == "__main__":
     crawl()
@@ -1,91 +1,136 @@
 import json
 import re
+from collections.abc import AsyncIterator
 from pathlib import Path
 
-import requests
+import httpx
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 STAFF_DB = {}
 
+# 질문마다 teachers 목록을 훑지 않도록 로딩 때 만들어 두는 색인
+_BY_SUBJECT: dict[str, list[str]] = {}   # 과목 -> 교사 이름들
+_BY_HOMEROOM: dict[str, str] = {}        # "1-3" -> 담임 이름
+_BY_DEPT_HEAD: dict[str, str] = {}       # 부서 -> 부장 이름
+
+# 마지막으로 읽은 staff.json의 수정 시각 (바뀌지 않았으면 다시 읽지 않음)
+_staff_mtime: int | None = None
+
 def load_staff_db():
-    global STAFF_DB
+    global STAFF_DB, _BY_SUBJECT, _BY_HOMEROOM, _BY_DEPT_HEAD, _staff_mtime
     path = Path(__file__).parent.parent / "data" / "staff.json"
     if path.exists():
+        mtime = path.stat().st_mtime_ns
+        if mtime == _staff_mtime:
+            return
         with path.open("r", encoding="utf-8") as f:
             STAFF_DB = json.load(f)
+        _staff_mtime = mtime
     else:
         STAFF_DB = {"teachers": [], "staff": []}
+        _staff_mtime = None
+
+    by_subject: dict[str, list[str]] = {}
+    by_homeroom: dict[str, str] = {}
+    by_dept_head: dict[str, str] = {}
+    for t in STAFF_DB.get("teachers", []):
+        if t.get("subject"):
+            by_subject.setdefault(t["subject"], []).append(t["name"])
+        if t.get("homeroom"):
+            by_homeroom.setdefault(t["homeroom"], t["name"])
+        if any("부장" in r for r in t.get("roles", [])):
+            for dept in t.get("departments", []):
+                by_dept_head.setdefault(dept, t["name"])
+
+    _BY_SUBJECT = by_subject
+    _BY_HOMEROOM = by_homeroom
+    _BY_DEPT_HEAD = by_dept_head
 
 load_staff_db()
 
-OLLAMA_CHAT_URL = "http://127.0.0.1:11434/api/chat"
+OLLAMA_BASE_URL = "http://127.0.0.1:11434"
 MODEL_NAME = "qwen2.5:7b"  
 
+# /ask 요청마다 새로 연결하지 않도록 keep-alive 커넥션을 재사용
+# (AsyncClient라서 여러 /ask가 이벤트 루프를 막지 않고 같은 풀을 나눠 씀)
+_OLLAMA = httpx.AsyncClient(
+    base_url=OLLAMA_BASE_URL,
+    timeout=120,
+    limits=httpx.Limits(max_keepalive_connections=4),
+)
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 KNOWLEDGE_PATH = BASE_DIR / "data" / "school_knowledge.txt"
 
+# 질문 키워드 -> 과목 (요청마다 새로 만들지 않도록 모듈 로딩 때 한 번만 생성)
+SUBJECT_KEYWORDS = (
+    ("국어", "국어"),
+    ("수학", "수학"),
+    ("영어", "영어"),
+    ("체육", "체육"),
+    ("물리", "물리"),
+    ("화학", "화학"),
+    ("생명과학", "생명과학"),
+    ("지구과학", "지구과학"),
+    ("사회", "사회"),
+    ("역사", "역사"),
+    ("윤리", "윤리"),
+    ("정보", "정보"),
+    ("중국어", "중국어"),
+)
+
+DEPT_KEYWORDS = (
+    "교무기획부",
+    "진로진학부",
+    "1학년부",
+    "2학년부",
+    "학력연구부",
+    "교육과정부",
+    "안전인성부",
+    "기숙사부",
+)
+
+# 담임 질문 패턴: "1학년 3반" 우선, 없으면 "1-3반" / "1 3"
+_HOMEROOM_RE = re.compile(r"([1-3])학년\s*([1-4])반")
+_HOMEROOM_SHORT_RE = re.compile(r"([1-3])[- ]\s*([1-4])반?")
+
 def answer_from_staff_db(question: str) -> str | None:
     q = question.strip()
-    teachers = STAFF_DB.get("teachers", [])
     staff = STAFF_DB.get("staff", [])
 
-    subject_map = {
-        "국어": "국어",
-        "수학": "수학",
-        "영어": "영어",
-        "체육": "체육",
-        "물리": "물리",
-        "화학": "화학",
-        "생명과학": "생명과학",
-        "지구과학": "지구과학",
-        "사회": "사회",
-        "역사": "역사",
-        "윤리": "윤리",
-        "정보": "정보",
-        "중국어": "중국어",
-    }
-
-    for keyword, subject in subject_map.items():
-        if keyword in q and ("교사" in q or "선생" in q):
-            names = [t["name"] for t in teachers if t.get("subject") == subject]
-            if names:
-                names_str = ", ".join(names)
-                return f"{subject} 교사는 {names_str} 선생님입니다."
+    # 1) 과목 교사 찾기 (예: "수학 선생님 누구야?")
+    if "교사" in q or "선생" in q:
+        for keyword, subject in SUBJECT_KEYWORDS:
+            if keyword in q:
+                names = _BY_SUBJECT.get(subject)
+                if names:
+                    names_str = ", ".join(names)
+                    return f"{subject} 교사는 {names_str} 선생님입니다."
 
     # 2) 담임 찾기 (예: "1학년 3반 담임", "1-3반 담임 선생님")
-    m = re.search(r"([1-3])학년\s*([1-4])반", q)
+    m = _HOMEROOM_RE.search(q)
     if not m:
-        m = re.search(r"([1-3])[- ]\s*([1-4])반?", q)
+        m = _HOMEROOM_SHORT_RE.search(q)
 
     if m and "담임" in q:
         grade = m.group(1)
         cls = m.group(2)
-        code = f"{grade}-{cls}"
-        for t in teachers:
-            if t.get("homeroom") == code:
-                return f"{grade}학년 {cls}반 담임은 {t['name']} 선생님입니다."
+        name = _BY_HOMEROOM.get(f"{grade}-{cls}")
+        if name:
+            return f"{grade}학년 {cls}반 담임은 {name} 선생님입니다."
         return f"{grade}학년 {cls}반 담임 정보는 데이터에 없습니다."
 
     # 3) 부장 / 부서장 찾기 (예: "진로진학부 부장", "교무기획부 부장")
-    dept_keywords = [
-        "교무기획부",
-        "진로진학부",
-        "1학년부",
-        "2학년부",
-        "학력연구부",
-        "교육과정부",
-        "안전인성부",
-        "기숙사부",
-    ]
-    for dept in dept_keywords:
-        if dept in q and "부장" in q:
-            for t in teachers:
-                if dept in t.get("departments", []) and any(
-                    "부장" in r for r in t.get("roles", [])
-                ):
-                    return f"{dept} 부장은 {t['name']} 선생님입니다."
+    if "부장" in q:
+        for dept in DEPT_KEYWORDS:
+            if dept not in q:
+                continue
+            name = _BY_DEPT_HEAD.get(dept)
+            if name:
+                return f"{dept} 부장은 {name} 선생님입니다."
 
     # 4) 학교장 / 교감
     if "교장" in q:
@@ -114,16 +159,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("shutdown")
+async def close_ollama_client():
+    await _OLLAMA.aclose()
+
 class Question(BaseModel):
     question: str
 
 # -----------------------------
 # 6. 학교 지식 파일 로딩
 # -----------------------------
+# (수정 시각, 내용) - 파일이 그대로면 다시 읽지 않고 바로 돌려줌
+_kb_cache: tuple[int, str] | None = None
+
 def load_knowledge() -> str:
-    if KNOWLEDGE_PATH.exists():
-        return KNOWLEDGE_PATH.read_text(encoding="utf-8").strip()
-    return ""
+    global _kb_cache
+    if not KNOWLEDGE_PATH.exists():
+        return ""
+
+    mtime = KNOWLEDGE_PATH.stat().st_mtime_ns
+    if _kb_cache is not None and _kb_cache[0] == mtime:
+        return _kb_cache[1]
+
+    text = KNOWLEDGE_PATH.read_text(encoding="utf-8").strip()
+    _kb_cache = (mtime, text)
+    return text
 
 SCHOOL_KNOWLEDGE = load_knowledge()
 
@@ -149,9 +209,11 @@ SCHOOL_KEYWORDS = [
     "도서관",
 ]
 
+# 키워드 전체를 하나의 패턴으로 묶어 질문을 한 번만 훑음 (대소문자 무시)
+_SCHOOL_KW_RE = re.compile("|".join(map(re.escape, SCHOOL_KEYWORDS)), re.IGNORECASE)
+
 def is_school_question(q: str) -> bool:
-    q_lower = q.lower()
-    return any(k.lower() in q_lower for k in SCHOOL_KEYWORDS)
+    return _SCHOOL_KW_RE.search(q) is not None
 
 # -----------------------------
 # 7. 기본 헬스체크
@@ -163,12 +225,12 @@ def read_root():
 # -----------------------------
 # 8. Ollama 대화 호출 함수
 # -----------------------------
-def call_ollama_chat(user_question: str) -> str:
-    knowledge_block = SCHOOL_KNOWLEDGE.strip()
+def build_system_prompt(knowledge: str) -> str:
+    knowledge_block = knowledge.strip()
 
     # 지식이 있으면 학교봇 모드, 없으면 일반 챗봇 모드
     if knowledge_block:
-        system_prompt = (
+        return (
             "당신은 창녕옥야고등학교 안내 챗봇입니다. "
             "반드시 자연스러운 한국어로만 답하십시오. "
             "아래 학교 정보를 최우선으로 참고해 정확히 답하십시오. "
@@ -177,46 +239,93 @@ def call_ollama_chat(user_question: str) -> str:
             "질문에 대한 최종 답만 간단히 말하십시오.\n\n"
             "학교 정보:\n" + knowledge_block
         )
-    else:
-        system_prompt = (
-            "당신은 친절한 한국어 챗봇입니다. "
-            "자연스러운 한국어로만 답하십시오. "
-            "모르는 내용은 추측하지 말고 '잘 모르겠습니다'라고 답하십시오."
-        )
+    return (
+        "당신은 친절한 한국어 챗봇입니다. "
+        "자연스러운 한국어로만 답하십시오. "
+        "모르는 내용은 추측하지 말고 '잘 모르겠습니다'라고 답하십시오."
+    )
+
+# 학교 지식은 시작할 때 한 번만 읽으므로 system prompt도 미리 만들어 둠
+_SYSTEM_PROMPT = build_system_prompt(SCHOOL_KNOWLEDGE)
+
+OLLAMA_OPTIONS = {
+    "temperature": 0.1,
+    "top_p": 0.9,
+}
 
+async def call_ollama_chat(user_question: str) -> AsyncIterator[str]:
+    """
+    Ollama에 스트리밍으로 질문하고, 답변 조각(토큰)을 순서대로 내보내는 iterator를 반환합니다.
+    연결/HTTP 오류는 첫 토큰을 보내기 전에 여기서 바로 예외로 올라옵니다.
+    """
     messages = [
-        {"role": "system", "content": system_prompt},
+        {"role": "system", "content": _SYSTEM_PROMPT},
         {"role": "user", "content": user_question},
     ]
 
-    res = requests.post(
-        OLLAMA_CHAT_URL,
+    req = _OLLAMA.build_request(
+        "POST",
+        "/api/chat",
         json={
             "model": MODEL_NAME,
             "messages": messages,
-            "stream": False,
-            "options": {
-                "temperature": 0.1,
-                "top_p": 0.9,
-            },
+            "stream": True,
+            "options": OLLAMA_OPTIONS,
         },
-        timeout=120,
     )
+    res = await _OLLAMA.send(req, stream=True)
 
     if res.status_code != 200:
+        await res.aread()
+        await res.aclose()
         raise RuntimeError(f"Ollama HTTP {res.status_code}: {res.text}")
 
-    data = res.json()
-    answer = (data.get("message", {}).get("content") or "").strip()
-    if not answer:
-        answer = "(모델이 비어 있는 응답을 보냈습니다.)"
-    return answer
+    return _iter_ollama_tokens(res)
+
+async def _iter_ollama_tokens(res: httpx.Response) -> AsyncIterator[str]:
+    # Ollama 스트림은 한 줄에 JSON 하나씩: {"message": {"content": "..."}, "done": false}
+    started = False
+    held = ""  # 아직 보내지 않은 끝쪽 공백
+    try:
+        async for line in res.aiter_lines():
+            if not line:
+                continue
+            chunk = json.loads(line)
+            if "error" in chunk:
+                yield f"(Ollama 오류: {chunk['error']})"
+                return
+
+            token = chunk.get("message", {}).get("content") or ""
+            if not started:
+                # 답변 앞쪽 공백/줄바꿈은 버림
+                token = token.lstrip()
+
+            # 끝쪽 공백/줄바꿈은 뒤에 글자가 더 올 때만 붙여 보냄 (답변 전체를 strip한 것과 같게)
+            body = token.rstrip()
+            if body:
+                started = True
+                yield held + body
+                held = token[len(body):]
+            elif started:
+                held += token
+
+            if chunk.get("done"):
+                break
+    except (json.JSONDecodeError, httpx.HTTPError) as e:
+        # 이미 200과 헤더를 보낸 뒤라 HTTP 오류로 바꿀 수 없으므로 답변 안에 알림
+        yield f"(Ollama 오류: {e})"
+        return
+    finally:
+        await res.aclose()
+
+    if not started:
+        yield "(모델이 비어 있는 응답을 보냈습니다.)"
 
 # -----------------------------
 # 9. /ask 엔드포인트
 # -----------------------------
 @app.post("/ask")
-def ask_ai(payload: Question):
+async def ask_ai(payload: Question):
     q = payload.question.strip()
     if not q:
         raise HTTPException(status_code=400, detail="question 필드가 비어 있습니다.")
@@ -236,10 +345,10 @@ def ask_ai(payload: Question):
             )
         }
 
-    # 3단계: 나머지는 LLM(qwen 등)에게 넘기기
+    # 3단계: 나머지는 LLM(qwen 등)에게 넘기기 (생성되는 대로 바로 흘려보냄)
     try:
-        answer = call_ollama_chat(q)
-        return {"answer": answer}
+        tokens = await call_ollama_chat(q)
+        return StreamingResponse(tokens, media_type="text/plain; charset=utf-8")
     except RuntimeError as e:
         raise HTTPException(status_code=500, detail=str(e))
     except Exception as e: